@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import requests
-from typing import Dict, List, Optional, Union
-from urllib.parse import quote
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote as _quote
 
 from robot.api import logger
 from robot.utils import ConnectionCache
@@ -11,7 +15,10 @@ from robot.utils import ConnectionCache
 class RequestConnection(object):
     """This class contains settings to connect to Apache Tomcat server via HTTP."""
 
-    def __init__(self, host: str, port: int, username: str, password: str, timeout: int) -> None:
+    HEADERS = {'Content-Type': 'text/plain'}
+
+    def __init__(self, host: str, port: int, username: str, password: str, timeout: int,
+                 pool_size: int = 4) -> None:
         """Initialization.
 
         *Args:*\n
@@ -20,16 +27,35 @@ class RequestConnection(object):
             _username_ - user name;\n
             _password_ - user password;\n
             _timeout_ - connection timeout;\n
+            _pool_size_ - maximum number of kept-alive connections to the server;\n
         """
         self.host = host
         self.port = port
         self.url = 'http://{host}:{port}/manager/text'.format(host=host, port=port)
+        self.list_url = self.url + '/list'
+        self.serverinfo_url = self.url + '/serverinfo'
+        self.stop_url = self.url + '/stop?path='
+        self.start_url = self.url + '/start?path='
+        self.reload_url = self.url + '/reload?path='
+        self.command_urls = {'stop': self.stop_url, 'start': self.start_url, 'reload': self.reload_url}
         self.auth = (username, password)
         self.timeout = timeout
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.HEADERS)
+        # Stop, start and reload change server state, so they are retried only if the connection failed.
+        retries = Retry(total=2, read=False, backoff_factor=0.2, raise_on_status=False)
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries))
+        read_retries = Retry(total=2, read=False, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                             raise_on_status=False)
+        read_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=read_retries)
+        self.session.mount(self.list_url, read_adapter)
+        self.session.mount(self.serverinfo_url, read_adapter)
+        self.apps_cache: Optional[Tuple[float, Dict[str, Tuple[str, ...]]]] = None
 
     def close(self) -> None:
         """Close connection."""
-        pass
+        self.session.close()
 
 
 class ApacheTomcatManager(object):
@@ -73,14 +99,22 @@ class ApacheTomcatManager(object):
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
+    _STOP_OK = 'OK - Stopped application at context path {}\n'
+    _START_OK = 'OK - Started application at context path {}\n'
+    _RELOAD_OK = 'OK - Reloaded application at context path {}\n'
+    _COMMANDS = {
+        'stop': (_STOP_OK, 'stopped'),
+        'start': (_START_OK, 'started'),
+        'reload': (_RELOAD_OK, 'reloaded'),
+    }
+
     def __init__(self) -> None:
         """ Initialization. """
         self._connection: Optional[RequestConnection] = None
-        self.headers: Dict[str, str] = {}
         self._cache = ConnectionCache()
 
     def connect_to_tomcat(self, host: str, port: Union[int, str], username: str = 'tomcat', password: str = 'tomcat',
-                          timeout: Union[int, str] = 15, alias: str = None) -> int:
+                          timeout: Union[int, str] = 15, alias: str = None, pool_size: Union[int, str] = 4) -> int:
         """Connect to Apache Tomcat server.
 
         *Args:*\n
@@ -90,6 +124,12 @@ class ApacheTomcatManager(object):
             _password_ - user password;\n
             _timeout_ - connection timeout;\n
             _alias_ - connection alias;\n
+            _pool_size_ - maximum number of kept-alive connections to the server;\n
+
+        Requests are retried up to two times if the connection to the server cannot be established.
+        Requests of keywords [#List|List], [#Serverinfo|Serverinfo] and application status keywords are also
+        retried if the server responds with status 502, 503 or 504. Requests that exceed _timeout_ while waiting
+        for the response are never retried and fail with ReadTimeout.
 
         *Returns:*\n
             The current connection index.
@@ -99,12 +139,12 @@ class ApacheTomcatManager(object):
         """
         port = int(port)
         timeout = int(timeout)
-        self.headers["Content-Type"] = "text/plain"
+        pool_size = int(pool_size)
 
         logger.debug(f'Connecting using : host={host}, port={port}, username={username}, password={password}, '
-                     f'timeout={timeout}, alias={alias}')
+                     f'timeout={timeout}, alias={alias}, pool_size={pool_size}')
 
-        self._connection = RequestConnection(host, port, username, password, timeout)
+        self._connection = RequestConnection(host, port, username, password, timeout, pool_size)
         return self._cache.register(self._connection, alias)
 
     def switch_tomcat_connection(self, index_or_alias: Union[int, str]) -> int:
@@ -182,19 +222,22 @@ class ApacheTomcatManager(object):
         if self._connection is None:
             raise Exception('No open connection to Apache Tomcat server.')
 
-        apps = []
-        url = f'{self._connection.url}/list'
+        url = self._connection.list_url
         logger.debug(f'Prepared request with method GET to {url}')
-        response = requests.get(url, auth=self._connection.auth, headers=self.headers, timeout=self._connection.timeout)
-        response.raise_for_status()
-        resp_list = response.text.split('\n')
-        for lines in resp_list[1:-1]:
-            apps.append(lines.split(':'))
-        return apps
+        with self._connection.session.get(url, timeout=self._connection.timeout, stream=True) as response:
+            response.raise_for_status()
+            self._set_response_encoding(response)
+            return [line.split(':', 3) for line in response.iter_lines(decode_unicode=True) if line.startswith('/')]
 
     def application_status(self, path: str) -> str:
         """Get the web application running status.
 
+        The list of applications is cached on the current connection for one second. The cache is reset by
+        [#Application Stop|Application Stop], [#Application Start|Application Start] and
+        [#Application Reload|Application Reload] of the same connection only, so the status may be up to one second
+        old after changes made via another connection or outside of the library.
+        Use [#Applications Status|Applications Status] to get the status without the cache.
+
         *Args:*\n
             _path_ - path to the web application;
 
@@ -209,11 +252,60 @@ class ApacheTomcatManager(object):
         =>
         running
         """
-        app_list = self.list()
-        for app_name, status, _, _ in app_list:
-            if app_name == path:
-                return status
-        raise Exception(f'Application with path "{path}" not found on Apache Tomcat')
+        app = self._list_as_dict().get(path)
+        if app is None:
+            raise Exception(f'Application with path "{path}" not found on Apache Tomcat')
+        return app[0]
+
+    def applications_status(self, paths: Optional[List[str]] = None) -> Dict[str, str]:
+        """Get running statuses of several web applications with a single request to the server.
+
+        The list of applications is always requested from the server, the cache of
+        [#Application Status|Application Status] is not used.
+
+        *Args:*\n
+            _paths_ - list of paths to web applications; if not specified, statuses of all installed applications
+            are returned;
+
+        *Returns:*\n
+            Dictionary of web application paths and their running statuses.
+
+        *Raises:*\n
+            raise Exception in case one of the web applications is not deployed on Apache Tomcat.
+
+        *Example:*\n
+        | @{paths}=  |  Create List  |  /dcs-workbench  |  /manager |
+        | ${statuses}=  |  Applications Status  |  ${paths} |
+        =>
+        | /dcs-workbench: running
+        | /manager: running
+        """
+        apps = self._list_as_dict(max_age=0)
+        if paths is None:
+            return {app_path: app[0] for app_path, app in apps.items()}
+        missing = [path for path in paths if path not in apps]
+        if missing:
+            raise Exception(f'Applications with paths {missing} not found on Apache Tomcat')
+        return {path: apps[path][0] for path in paths}
+
+    def _list_as_dict(self, max_age: float = 1.0) -> Dict[str, Tuple[str, ...]]:
+        """Get installed applications indexed by path, reusing the cached list if it is fresh enough.
+
+        *Args:*\n
+            _max_age_ - maximum age of the cached list in seconds;
+
+        *Returns:*\n
+            Dictionary of application path and tuple (running status, number of sessions, application name).
+        """
+        if self._connection is None:
+            raise Exception('No open connection to Apache Tomcat server.')
+
+        now = time.monotonic()
+        cache = self._connection.apps_cache
+        if cache is None or now - cache[0] > max_age:
+            apps = {app[0]: tuple(app[1:]) for app in self.list()}
+            self._connection.apps_cache = cache = (now, apps)
+        return cache[1]
 
     def serverinfo(self) -> Dict[str, str]:
         """Get information about server.
@@ -238,17 +330,14 @@ class ApacheTomcatManager(object):
         if self._connection is None:
             raise Exception('No open connection to Apache Tomcat server.')
 
-        serverinfo = {}
-        url = f'{self._connection.url}/serverinfo'
+        url = self._connection.serverinfo_url
         logger.debug(f'Prepared request with method GET to {url}')
-        response = requests.get(url, auth=self._connection.auth, headers=self.headers, timeout=self._connection.timeout)
-        response.raise_for_status()
-        resp_list = response.text.split('\n')
-
-        for lines in resp_list[1:-1]:
-            key, value = lines.rstrip().split(":", 1)
-            serverinfo[key] = value.lstrip()
-        return serverinfo
+        with self._connection.session.get(url, timeout=self._connection.timeout, stream=True) as response:
+            response.raise_for_status()
+            self._set_response_encoding(response)
+            return {key.strip(): value.strip()
+                    for key, sep, value in (line.partition(':') for line in response.iter_lines(decode_unicode=True))
+                    if sep}
 
     def application_stop(self, path: str) -> None:
         """Stop the running web application.
@@ -262,15 +351,7 @@ class ApacheTomcatManager(object):
         *Example:*\n
         |  Application Stop  |  /dcs-workbench |
         """
-        if self._connection is None:
-            raise Exception('No open connection to Apache Tomcat server.')
-
-        url = f'{self._connection.url}/stop?path={quote(path)}'
-        logger.debug(f'Prepared request with method GET to {url}')
-        response = requests.get(url, auth=self._connection.auth, headers=self.headers, timeout=self._connection.timeout)
-        logger.debug(f'Response: {response.text}')
-        if response.text != f'OK - Stopped application at context path {path}\n':
-            raise Exception('Application  is not stopped:\n' + response.text)
+        self._manager_command('stop', path)
 
     def application_start(self, path: str) -> None:
         """Start web application.
@@ -284,15 +365,7 @@ class ApacheTomcatManager(object):
         *Example:*\n
         |  Application Start  |  /dcs-workbench |
         """
-        if self._connection is None:
-            raise Exception('No open connection to Apache Tomcat server.')
-
-        url = f'{self._connection.url}/start?path={quote(path)}'
-        logger.debug(f'Prepared request with method GET to {url}')
-        response = requests.get(url, auth=self._connection.auth, headers=self.headers, timeout=self._connection.timeout)
-        logger.debug(f'Response: {response.text}')
-        if response.text != f'OK - Started application at context path {path}\n':
-            raise Exception('Application  is not started:\n' + response.text)
+        self._manager_command('start', path)
 
     def application_reload(self, path: str) -> None:
         """Reload web application.
@@ -306,12 +379,111 @@ class ApacheTomcatManager(object):
         *Example:*\n
         |  Application Reload  |  /dcs-workbench |
         """
+        self._manager_command('reload', path)
+
+    def applications_start(self, paths: List[str], concurrency: Union[int, str] = 4) -> None:
+        """Start several web applications concurrently.
+
+        Requests are sent in parallel over the connection pool of the current connection, so _concurrency_ should
+        not exceed _pool_size_ of [#Connect To Tomcat|Connect To Tomcat]. Requests and responses are logged after all
+        of them are completed.
+
+        *Args:*\n
+            _paths_ - list of paths to web applications;\n
+            _concurrency_ - maximum number of simultaneous requests;
+
+        *Raises:*\n
+            raise Exception listing the web applications that could not be started.
+
+        *Example:*\n
+        | @{paths}=  |  Create List  |  /dcs-workbench  |  /dcs |
+        | Applications Start  |  ${paths} |
+        """
         if self._connection is None:
             raise Exception('No open connection to Apache Tomcat server.')
 
-        url = f'{self._connection.url}/reload?path={quote(path)}'
+        conn = self._connection
+        concurrency = int(concurrency)
+        conn.apps_cache = None
+        urls = [(path, conn.start_url + _quote(path, safe='/')) for path in paths]
+        # Robot Framework logger ignores messages from other threads, so responses are logged after the pool is done.
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(paths)))) as executor:
+            futures = [(path, url, executor.submit(self._send_command, conn, url)) for path, url in urls]
+
+        errors = []
+        for path, url, future in futures:
+            logger.debug(f'Prepared request with method GET to {url}')
+            error = future.exception()
+            if error is None:
+                text = future.result()
+                logger.debug(f'Response: {text}')
+                try:
+                    self._check_command('start', path, text)
+                except Exception as check_error:
+                    error = check_error
+            if error is not None:
+                errors.append(f'{path}: {error}')
+        if errors:
+            raise Exception('Applications are not started:\n' + '\n'.join(errors))
+
+    def _manager_command(self, action: str, path: str) -> None:
+        """Run manager command on the web application and check its result.
+
+        *Args:*\n
+            _action_ - manager command: stop, start or reload;\n
+            _path_ - path to web application;
+
+        *Raises:*\n
+            raise Exception in case the command was not completed successfully.
+        """
+        conn = self._connection
+        if conn is None:
+            raise Exception('No open connection to Apache Tomcat server.')
+
+        conn.apps_cache = None
+        url = conn.command_urls[action] + _quote(path, safe='/')
         logger.debug(f'Prepared request with method GET to {url}')
-        response = requests.get(url, auth=self._connection.auth, headers=self.headers, timeout=self._connection.timeout)
-        logger.debug(f'Response: {response.text}')
-        if response.text != f'OK - Reloaded application at context path {path}\n':
-            raise Exception('Application  is not started:\n' + response.text)
+        text = self._send_command(conn, url)
+        logger.debug(f'Response: {text}')
+        self._check_command(action, path, text)
+
+    def _send_command(self, conn: RequestConnection, url: str) -> str:
+        """Send manager command request without logging, so it can be used from worker threads.
+
+        *Args:*\n
+            _conn_ - connection to Apache Tomcat server;\n
+            _url_ - manager command URL;
+
+        *Returns:*\n
+            Response text.
+        """
+        response = conn.session.get(url, timeout=conn.timeout)
+        self._set_response_encoding(response)
+        return response.text
+
+    def _set_response_encoding(self, response: requests.Response) -> None:
+        """Decode the response as UTF-8 unless the server declared a charset.
+
+        Without a charset requests falls back to ISO-8859-1 for text/plain responses of Apache Tomcat manager,
+        which breaks non-ASCII context paths.
+
+        *Args:*\n
+            _response_ - response of Apache Tomcat manager;
+        """
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = 'utf-8'
+
+    def _check_command(self, action: str, path: str, text: str) -> None:
+        """Check the response of manager command.
+
+        *Args:*\n
+            _action_ - manager command: stop, start or reload;\n
+            _path_ - path to web application;\n
+            _text_ - response text;
+
+        *Raises:*\n
+            raise Exception in case the command was not completed successfully.
+        """
+        expected, state = self._COMMANDS[action]
+        if text != expected.format(path):
+            raise Exception(f'Application  is not {state}:\n' + text)